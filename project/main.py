@@ -2,7 +2,7 @@
 Main entry to generate exams from law .docx files.
 
 Usage:
-  python main.py --config /path/to/config.json --seed 2025 --out-prefix exam_01
+  python main.py --config /path/to/config.json --seed 2025 --out-prefix exam_01 [--low-memory]
 """
 
 from __future__ import annotations
@@ -27,16 +27,17 @@ def main():
     parser.add_argument("--config", default="/workspace/project/config.json", help="Path to config.json")
     parser.add_argument("--seed", type=int, default=None, help="Random seed override")
     parser.add_argument("--out-prefix", default="exam_01", help="Output file prefix")
+    parser.add_argument("--low-memory", action="store_true", help="Parse .docx with the stdlib XML parser to bound memory use")
     args = parser.parse_args()
 
     cfg = load_config(args.config)
     seed = args.seed if args.seed is not None else cfg.get("seed", 42)
-    random.seed(seed)
     rng = random.Random(seed)
 
     input_dir = cfg.get("input_dir", ".")
     print(f"[main] Parsing .docx from {input_dir}")
-    articles = docx_parser.parse_directory(input_dir)
+    low_memory = args.low_memory or bool(cfg.get("low_memory", False))
+    articles = docx_parser.parse_directory(input_dir, low_memory=low_memory)
     if not articles:
         print("[main] No articles found. Please add .docx files.")
         # For empty input, fabricate a tiny sample to allow dry-run
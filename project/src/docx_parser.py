@@ -14,21 +14,32 @@ List[{
     'title': str,               # optional short title if detected
     'text': str,                # full concatenated text of the article
     'clauses': List[str],       # split by 款/项 heuristics
+    'entities': Dict,           # text_processor.extract_entities(text)
 }]
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Iterator, List, Dict
+import os
 import re
+import zipfile
 from pathlib import Path
+from xml.etree import ElementTree
 
-from docx import Document
+from lxml import etree
+
+from . import text_processor as tp
 
 
 ARTICLE_PATTERN = re.compile(r"^第[一二三四五六七八九十百千0-9]+条")
 CLAUSE_SPLIT_PATTERN = re.compile(r"[（(][一二三四五六七八九十0-9]+[)）]|第[一二三四五六七八九十0-9]+款")
+CLAUSE_BOUNDARY_PATTERN = re.compile(r"(?=(?:第[一二三四五六七八九十0-9]+款|[（(][一二三四五六七八九十0-9]+[)）]))")
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
 
 
 @dataclass
@@ -38,6 +49,7 @@ class Article:
     title: str
     text: str
     clauses: List[str]
+    entities: Dict = field(default_factory=dict)
 
     def to_dict(self) -> Dict:
         return {
@@ -46,12 +58,90 @@ class Article:
             "title": self.title,
             "text": self.text,
             "clauses": self.clauses,
+            "entities": self.entities,
         }
 
 
-def read_docx(file_path: Path) -> List[Article]:
-    doc = Document(str(file_path))
-    paragraphs = [p.text.strip() for p in doc.paragraphs if p.text and p.text.strip()]
+def _run_text(r) -> str:
+    parts = []
+    for node in r:
+        if node.tag == f"{W_NS}t":
+            parts.append(node.text or "")
+        elif node.tag in (f"{W_NS}tab", f"{W_NS}ptab"):
+            parts.append("\t")
+        elif node.tag == f"{W_NS}br":
+            # Page and column breaks carry no text
+            if node.get(f"{W_NS}type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif node.tag == f"{W_NS}cr":
+            parts.append("\n")
+        elif node.tag == f"{W_NS}noBreakHyphen":
+            parts.append("-")
+    return "".join(parts)
+
+
+def _paragraph_text(p) -> str:
+    # Mirrors python-docx's paragraph text: only runs directly in the paragraph or in its
+    # hyperlinks count, so text boxes (w:txbxContent inside drawings/mc:Fallback) are skipped.
+    # Works on both lxml and xml.etree elements.
+    parts = []
+    for child in p:
+        if child.tag == f"{W_NS}r":
+            parts.append(_run_text(child))
+        elif child.tag == f"{W_NS}hyperlink":
+            parts.extend(_run_text(r) for r in child if r.tag == f"{W_NS}r")
+    return "".join(parts).strip()
+
+
+def iter_paragraphs(file_path: Path) -> Iterator[str]:
+    """Stream non-empty body paragraph texts from word/document.xml without building a DOM.
+
+    Like python-docx's Document.paragraphs, only paragraphs directly under w:body are
+    yielded, so table cells are skipped; text boxes anchored in a paragraph do not
+    contribute to its text.
+    """
+    with zipfile.ZipFile(file_path) as z, z.open("word/document.xml") as f:
+        for _, elem in etree.iterparse(f, events=("end",), tag=f"{W_NS}p"):
+            parent = elem.getparent()
+            if parent is None or parent.tag != f"{W_NS}body":
+                continue
+            text = _paragraph_text(elem)
+            elem.clear()
+            # Drop already-read siblings (paragraphs, tables) so memory stays bounded
+            while elem.getprevious() is not None:
+                del parent[0]
+            if text:
+                yield text
+
+
+def iter_paragraphs_lowmem(file_path: Path) -> Iterator[str]:
+    """Like iter_paragraphs, but with the stdlib parser, dropping each top-level body child once read.
+
+    lxml can retain large amounts of memory on big documents; xml.etree keeps RSS bounded.
+    """
+    with zipfile.ZipFile(file_path) as z, z.open("word/document.xml") as f:
+        depth = 0
+        body = None
+        for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 2 and elem.tag == f"{W_NS}body":
+                    body = elem
+                continue
+            if depth == 3 and elem.tag == f"{W_NS}p":
+                # Only paragraphs directly under w:body, as in iter_paragraphs
+                text = _paragraph_text(elem)
+                elem.clear()
+                if text:
+                    yield text
+            if depth == 3 and body is not None:
+                # Finished a direct child of w:body (paragraph, table, ...); release it
+                body.clear()
+            depth -= 1
+
+
+def read_docx(file_path: Path, low_memory: bool = False) -> List[Article]:
+    paragraphs = iter_paragraphs_lowmem(file_path) if low_memory else iter_paragraphs(file_path)
 
     articles: List[Article] = []
     current_no = None
@@ -71,6 +161,7 @@ def read_docx(file_path: Path) -> List[Article]:
                 title=current_title,
                 text=full_text,
                 clauses=clauses,
+                entities=tp.extract_entities(full_text),
             )
         )
         current_no = None
@@ -78,12 +169,11 @@ def read_docx(file_path: Path) -> List[Article]:
         buffer = []
 
     for para in paragraphs:
-        if ARTICLE_PATTERN.match(para):
+        m = ARTICLE_PATTERN.match(para)
+        if m is not None:
             # Start of a new article
             flush_article()
             # Extract article number and optional title
-            m = ARTICLE_PATTERN.match(para)
-            assert m is not None
             current_no = m.group(0)
             current_title = para[m.end():].strip(" 　：:.-")
             if current_title and len(current_title) > 50:
@@ -101,12 +191,16 @@ def read_docx(file_path: Path) -> List[Article]:
     return articles
 
 
+def read_docx_lowmem(file_path: Path) -> List[Article]:
+    return read_docx(file_path, low_memory=True)
+
+
 def split_clauses(text: str) -> List[str]:
     # Heuristic: split by line breaks first, then further by 款/项 markers
     lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
     chunks: List[str] = []
     for line in lines:
-        parts = re.split(r"(?=(?:第[一二三四五六七八九十0-9]+款|[（(][一二三四五六七八九十0-9]+[)）]))", line)
+        parts = CLAUSE_BOUNDARY_PATTERN.split(line)
         for part in parts:
             part = part.strip()
             if part:
@@ -114,16 +208,43 @@ def split_clauses(text: str) -> List[str]:
     return chunks or ([text] if text else [])
 
 
-def parse_directory(input_dir: str) -> List[Dict]:
+def parse_directory(input_dir: str, low_memory: bool = False) -> List[Dict]:
     path = Path(input_dir)
+    reader = read_docx_lowmem if low_memory else read_docx
+    files = list(path.glob("*.docx"))
     all_articles: List[Dict] = []
-    for file in path.glob("*.docx"):
+
+    def collect(file: Path, read: Callable[[], List[Article]]) -> None:
         try:
-            arts = read_docx(file)
-            all_articles.extend([a.to_dict() for a in arts])
+            arts = read()
+        except BrokenProcessPool:
+            # A dead worker is not this file's fault; let the caller recover
+            raise
         except Exception as exc:
             # Skip problematic files but continue
             print(f"[docx_parser] Failed to read {file}: {exc}")
+            return
+        all_articles.extend([a.to_dict() for a in arts])
+
+    if low_memory or len(files) <= 1:
+        # Serial and in-process: parallel workers would multiply peak memory, and a
+        # single file has no parallelism to gain from spawning a worker
+        for file in files:
+            collect(file, partial(reader, file))
+        return all_articles
+
+    # Files are independent; parse them across cores, collecting in glob order
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as ex:
+            futures = [(file, ex.submit(reader, file)) for file in files]
+            for file, fut in futures:
+                collect(file, fut.result)
+                done += 1
+    except BrokenProcessPool as exc:
+        # A worker died (e.g. killed for memory); every pending future is lost with it
+        remaining = files[done:]
+        print(f"[docx_parser] Worker pool broke ({exc}); parsing {len(remaining)} remaining file(s) in-process")
+        for file in remaining:
+            collect(file, partial(reader, file))
     return all_articles
-
-
@@ -4,12 +4,16 @@ latex_generator.py
 Render LaTeX exam files using exam-zh style.
 
 We produce two .tex files: exam (no answers) and answers (with \printanswers).
+With "shared_body" set in the config, the question body goes to a third
+<prefix>_body.tex that both files \input.
 """
 
 from __future__ import annotations
 
 from typing import Dict, List
 from pathlib import Path
+import io
+import re
 
 
 HEADER_TMPL = r"""
@@ -39,6 +43,34 @@ FOOTER_TMPL = r"""
 """
 
 
+# Per-question fragments; fixed LaTeX is built once and only the fields are filled per question
+SECTION_OPEN_TMPL = "\\section*{{{title}}}\n\\begin{{questions}}\n"
+SECTION_CLOSE = "\\end{questions}\n"
+TRUE_FALSE_TMPL = "\\question {q}\\ifprintanswers\\par\\textbf{{答案：}}{a}\\fi\n"
+CHOICE_ITEM_TMPL = "\\item {opt}"
+CHOICE_TMPL = (
+    "\\question {q}\n"
+    "\\begin{{enumerate}}[label=\\Alph*.]\n{items}\n\\end{{enumerate}}\n"
+    "\\ifprintanswers\\par\\textbf{{答案：}}{a}\\fi\n"
+)
+OPEN_TMPL = "\\question {q}\n\\ifprintanswers\\par\\textbf{{{label}：}}{a}\\fi\n"
+
+
+LATEX_ESCAPE_MAP = {
+    "\\": r"\textbackslash{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+}
+LATEX_SPECIAL_RE = re.compile(r"[\\&%$#_{}~^]")
+
+
 def _points_sum(points_cfg: Dict, counts_cfg: Dict) -> int:
     return (
         points_cfg.get("true_false", 0) * counts_cfg.get("true_false", 0)
@@ -49,108 +81,95 @@ def _points_sum(points_cfg: Dict, counts_cfg: Dict) -> int:
     )
 
 
-def render_exam_latex(exam: Dict[str, List[Dict]], cfg: Dict, with_answers: bool) -> str:
+def render_header(cfg: Dict, with_answers: bool) -> str:
     title = cfg.get("exam_title", "考试试卷")
     total = _points_sum(cfg.get("points", {}), cfg.get("counts", {}))
     header = HEADER_TMPL.replace("%TITLE%", title).replace("%TIME%", str(cfg.get("exam_time_minutes", 120))).replace("%TOTAL%", str(total))
+    if with_answers:
+        # Insert \printanswers after \begin{document}
+        return header.replace("\\begin{document}", "\\begin{document}\n\\printanswers")
+    # Ensure answers hidden
+    return header.replace("\\usepackage{exam-zh}", "\\usepackage[answers=false]{exam-zh}")
 
-    body = []
 
-    def section(title: str):
-        body.append(f"\\section*{{{title}}}")
+def render_body(exam: Dict[str, List[Dict]]) -> str:
+    # Answers are wrapped in \ifprintanswers, so the same body serves both files
+    buf = io.StringIO()
+    w = buf.write
 
     def render_choices(options: List[str]) -> str:
-        items = "\n".join([f"\\item {opt}" for opt in options])
-        return f"\\begin{{enumerate}}[label=\\Alph*.]\n{items}\n\\end{{enumerate}}"
+        return "\n".join([CHOICE_ITEM_TMPL.format(opt=latex_escape(o)) for o in options])
 
     # True/False
     if exam.get("true_false"):
-        section("一、判断题")
-        body.append("\\begin{questions}")
+        w(SECTION_OPEN_TMPL.format(title="一、判断题"))
         for q in exam["true_false"]:
-            ans = q["answer"]
-            body.append("\\question {}\\ifprintanswers\\par\\textbf{答案：}" + ans + "\\fi".format(latex_escape(q["question"])) )
-        body.append("\\end{questions}")
+            w(TRUE_FALSE_TMPL.format(q=latex_escape(q["question"]), a=q["answer"]))
+        w(SECTION_CLOSE)
 
     # Single choice
     if exam.get("single"):
-        section("二、单选题")
-        body.append("\\begin{questions}")
+        w(SECTION_OPEN_TMPL.format(title="二、单选题"))
         for q in exam["single"]:
-            body.append("\\question {}".format(latex_escape(q["question"])) )
-            body.append(render_choices([latex_escape(o) for o in q["options"]]))
-            body.append("\\ifprintanswers\\par\\textbf{答案：}" + latex_escape(q["answer"]) + "\\fi")
-        body.append("\\end{questions}")
+            w(CHOICE_TMPL.format(q=latex_escape(q["question"]), items=render_choices(q["options"]), a=latex_escape(q["answer"])))
+        w(SECTION_CLOSE)
 
     # Multiple choice
     if exam.get("multiple"):
-        section("三、多选题")
-        body.append("\\begin{questions}")
+        w(SECTION_OPEN_TMPL.format(title="三、多选题"))
         for q in exam["multiple"]:
-            body.append("\\question {}".format(latex_escape(q["question"])) )
-            body.append(render_choices([latex_escape(o) for o in q["options"]]))
-            body.append("\\ifprintanswers\\par\\textbf{答案：}" + ",".join(q["answer"]) + "\\fi")
-        body.append("\\end{questions}")
+            w(CHOICE_TMPL.format(q=latex_escape(q["question"]), items=render_choices(q["options"]), a=",".join(q["answer"])))
+        w(SECTION_CLOSE)
 
     # Fill in the blank
     if exam.get("fill"):
-        section("四、填空题")
-        body.append("\\begin{questions}")
+        w(SECTION_OPEN_TMPL.format(title="四、填空题"))
         for q in exam["fill"]:
-            body.append("\\question {}".format(latex_escape(q["question"])) )
-            body.append("\\ifprintanswers\\par\\textbf{答案：}" + latex_escape(str(q["answer"])) + "\\fi")
-        body.append("\\end{questions}")
+            w(OPEN_TMPL.format(q=latex_escape(q["question"]), label="答案", a=latex_escape(str(q["answer"]))))
+        w(SECTION_CLOSE)
 
     # Short answers
     if exam.get("short"):
-        section("五、简答题")
-        body.append("\\begin{questions}")
+        w(SECTION_OPEN_TMPL.format(title="五、简答题"))
         for q in exam["short"]:
-            body.append("\\question {}".format(latex_escape(q["question"])) )
-            body.append("\\ifprintanswers\\par\\textbf{要点：}" + latex_escape(q["answer"]) + "\\fi")
-        body.append("\\end{questions}")
+            w(OPEN_TMPL.format(q=latex_escape(q["question"]), label="要点", a=latex_escape(q["answer"])))
+        w(SECTION_CLOSE)
+
+    return buf.getvalue()
 
-    content = "\n".join(body)
-    if with_answers:
-        # Insert \printanswers after \begin{document}
-        header = header.replace("\\begin{document}", "\\begin{document}\n\\printanswers")
-    else:
-        # Ensure answers hidden
-        header = header.replace("\\usepackage{exam-zh}", "\\usepackage[answers=false]{exam-zh}")
 
-    return header + content + "\n" + FOOTER_TMPL
+def render_exam_latex(exam: Dict[str, List[Dict]], cfg: Dict, with_answers: bool) -> str:
+    return render_header(cfg, with_answers) + render_body(exam) + FOOTER_TMPL
 
 
 def write_exam_files(exam: Dict[str, List[Dict]], cfg: Dict, out_prefix: str) -> Dict[str, str]:
     out_dir = Path(cfg.get("output_dir", "."))
     out_dir.mkdir(parents=True, exist_ok=True)
-    exam_tex = render_exam_latex(exam, cfg, with_answers=False)
-    ans_tex = render_exam_latex(exam, cfg, with_answers=True)
+    # Both files share the same body; render it once
+    body = render_body(exam)
 
     f1 = out_dir / f"{out_prefix}.tex"
     f2 = out_dir / f"{out_prefix}_answers.tex"
-    f1.write_text(exam_tex, encoding="utf-8")
-    f2.write_text(ans_tex, encoding="utf-8")
-    return {"exam": str(f1), "answers": str(f2)}
+    out = {"exam": str(f1), "answers": str(f2)}
+    if cfg.get("shared_body", False):
+        # Write the body once and \input it from two thin wrappers
+        f_body = out_dir / f"{out_prefix}_body.tex"
+        f_body.write_bytes(body.encode("utf-8"))
+        body = f"\\input{{{f_body.stem}}}\n"
+        out["body"] = str(f_body)
 
+    f1.write_bytes((render_header(cfg, with_answers=False) + body + FOOTER_TMPL).encode("utf-8"))
+    f2.write_bytes((render_header(cfg, with_answers=True) + body + FOOTER_TMPL).encode("utf-8"))
+    return out
 
-def latex_escape(s: str) -> str:
-    # Minimal escaping for LaTeX special chars
-    repl = {
-        "\\": r"\textbackslash{}",
-        "&": r"\&",
-        "%": r"\%",
-        "$": r"\$",
-        "#": r"\#",
-        "_": r"\_",
-        "{": r"\{",
-        "}": r"\}",
-        "~": r"\textasciitilde{}",
-        "^": r"\textasciicircum{}",
-    }
-    out = []
-    for ch in s:
-        out.append(repl.get(ch, ch))
-    return "".join(out)
+
+def _escape_match(m: re.Match) -> str:
+    return LATEX_ESCAPE_MAP[m.group(0)]
 
 
+def latex_escape(s: str) -> str:
+    # Minimal escaping for LaTeX special chars; most text has none, so check first
+    if not LATEX_SPECIAL_RE.search(s):
+        return s
+    # Substitute only the matched characters
+    return LATEX_SPECIAL_RE.sub(_escape_match, s)
@@ -15,26 +15,35 @@ Question schema (dict):
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
 import random
-import re
+
+import numpy as np
 
 from . import text_processor as tp
 
 
-def weighted_sample(articles: List[Dict], weights_cfg: Dict, k: int) -> List[Dict]:
-    imp_list = set(weights_cfg.get("important_articles", []) or [])
+def article_entities(art: Dict) -> Dict:
+    # Parsed articles carry entities computed at parse time; hand-built dicts fall back to extraction
+    return art.get("entities") or tp.extract_entities(art["text"])
+
+
+def article_weights(articles: List[Dict], weights_cfg: Dict) -> np.ndarray:
+    imp_set = set(weights_cfg.get("important_articles", []) or [])
     imp_w = float(weights_cfg.get("important_weight", 1.0))
     default_w = float(weights_cfg.get("default", 1.0))
 
-    weights: List[float] = []
-    for a in articles:
-        w = imp_w if a.get("article_no") in imp_list else default_w
-        weights.append(w)
+    imp_mask = np.fromiter((a.get("article_no") in imp_set for a in articles), dtype=bool, count=len(articles))
+    weights = np.where(imp_mask, imp_w, default_w)
+    return weights / weights.sum()
+
 
+def weighted_sample(articles: List[Dict], p: np.ndarray, k: int, rng: np.random.Generator) -> List[Dict]:
+    if not articles:
+        return []
     # Sample with replacement to allow enough items; we'll dedupe content later
-    population = list(range(len(articles)))
-    chosen_idx = random.choices(population, weights=weights, k=min(k, max(1, len(population))))
+    chosen_idx = rng.choice(len(articles), size=min(k, len(articles)), p=p)
     return [articles[i] for i in chosen_idx]
 
 
@@ -42,7 +51,7 @@ def make_true_false(arts: List[Dict], count: int, rng: random.Random) -> List[Di
     results: List[Dict] = []
     seen: set = set()
     for art in arts:
-        entities = tp.extract_entities(art["text"])
+        entities = article_entities(art)
         for sent in entities["sentences"]:
             if len(results) >= count:
                 break
@@ -74,31 +83,32 @@ def negate_statement(s: str) -> str:
         if a in s:
             return s.replace(a, b, 1)
     # If no modal swap, tweak a number if present
-    m = re.search(r"\d+", s)
+    m = tp.NUMBER_RE.search(s)
     if m:
         num = int(m.group(0))
         return s[:m.start()] + str(num + 1) + s[m.end():]
     return s + "（本句可能为错误陈述）"
 
 
-def make_single_choice(arts: List[Dict], count: int, rng: random.Random) -> List[Dict]:
+def make_single_choice(arts: List[Dict], count: int, rng: random.Random, distractor_pool: DistractorPool) -> List[Dict]:
     results: List[Dict] = []
     seen_q: set = set()
-    distractor_pool = build_distractor_pool(arts)
     for art in arts:
         if len(results) >= count:
             break
-        entities = tp.extract_entities(art["text"])
+        entities = article_entities(art)
         kws = tp.pick_keywords(entities, max_k=5)
         if not kws:
             continue
         stem = rng.choice(entities["sentences"]) if entities["sentences"] else art["text"][:50]
         key = rng.choice(kws)
         correct = f"关于“{key}”的表述符合该法条"
-        distractors = sample_distractors(distractor_pool, key, n=3, rng=rng)
-        options = [correct] + distractors
-        rng.shuffle(options)
-        ans = options.index(correct)
+        distractors = sample_distractors(distractor_pool, [key], n=3, rng=rng)
+        # Tag the correct option so its position survives the shuffle
+        tagged = [(correct, True)] + [(d, False) for d in distractors]
+        rng.shuffle(tagged)
+        options = [opt for opt, _ in tagged]
+        ans = next(i for i, (_, is_correct) in enumerate(tagged) if is_correct)
         qtext = f"依据{art['article_no']}，下列哪一项是正确的？\n{stem}"
         if qtext in seen_q:
             continue
@@ -113,23 +123,23 @@ def make_single_choice(arts: List[Dict], count: int, rng: random.Random) -> List
     return results
 
 
-def make_multiple_choice(arts: List[Dict], count: int, rng: random.Random) -> List[Dict]:
+def make_multiple_choice(arts: List[Dict], count: int, rng: random.Random, distractor_pool: DistractorPool) -> List[Dict]:
     results: List[Dict] = []
-    distractor_pool = build_distractor_pool(arts)
     for art in arts:
         if len(results) >= count:
             break
-        entities = tp.extract_entities(art["text"])
+        entities = article_entities(art)
         kws = tp.pick_keywords(entities, max_k=6)
         if len(kws) < 2:
             continue
         stem = rng.choice(entities["sentences"]) if entities["sentences"] else art["text"][:50]
         num_correct = rng.randint(2, min(4, len(kws)))
         correct = [f"与“{kw}”相关的规定符合该法条" for kw in rng.sample(kws, num_correct)]
-        distractors = sample_distractors(distractor_pool, "|".join(kws), n=5 - num_correct, rng=rng)
-        options = correct + distractors
-        rng.shuffle(options)
-        ans_letters = [chr(ord('A') + i) for i, opt in enumerate(options) if opt in correct]
+        distractors = sample_distractors(distractor_pool, kws, n=5 - num_correct, rng=rng)
+        tagged = [(opt, True) for opt in correct] + [(d, False) for d in distractors]
+        rng.shuffle(tagged)
+        options = [opt for opt, _ in tagged]
+        ans_letters = [chr(ord('A') + i) for i, (_, is_correct) in enumerate(tagged) if is_correct]
         qtext = f"依据{art['article_no']}，下列哪些项是正确的？\n{stem}"
         results.append({
             "type": "multiple",
@@ -146,15 +156,20 @@ def make_fill_blank(arts: List[Dict], count: int, rng: random.Random) -> List[Di
     for art in arts:
         if len(results) >= count:
             break
-        entities = tp.extract_entities(art["text"])
-        candidates = (entities.get("terms", []) or []) + (entities.get("numbers", []) or [])
+        entities = article_entities(art)
+        term_spans = entities.get("term_spans") or {}
+        # Only targets that appear in some sentence, so the blank always lands in the stem
+        candidates = [
+            t for t in (entities.get("terms", []) or []) + (entities.get("numbers", []) or [])
+            if t in term_spans
+        ]
         if not candidates:
             continue
         target = rng.choice(candidates)
-        sent = rng.choice(entities["sentences"]) if entities["sentences"] else art["text"]
-        if target not in sent:
-            sent = art["text"]
-        blanked = sent.replace(target, "\\rule{2cm}{0.4pt}", 1)
+        # Blank the exact recorded occurrence, so "1" never hits a digit inside "2021"
+        i, start, end = rng.choice(term_spans[target])
+        sent = entities["sentences"][i]
+        blanked = sent[:start] + "\\rule{2cm}{0.4pt}" + sent[end:]
         results.append({
             "type": "fill",
             "question": blanked,
@@ -185,20 +200,35 @@ def make_short_answers(arts: List[Dict], count: int) -> List[Dict]:
     return results
 
 
-def build_distractor_pool(arts: List[Dict]) -> List[str]:
-    pool: List[str] = []
+@dataclass
+class DistractorPool:
+    entries: List[str]
+    kw_to_indices: Dict[str, Set[int]]
+
+
+def build_distractor_pool(arts: List[Dict]) -> DistractorPool:
+    entries: List[str] = []
+    kw_to_indices: Dict[str, Set[int]] = {}
+    index_of: Dict[str, int] = {}
     for art in arts:
-        ents = tp.extract_entities(art["text"])
+        ents = article_entities(art)
         for kw in tp.pick_keywords(ents, max_k=4):
-            pool.append(f"关于“{kw}”的表述不符合该法条")
-    # De-duplicate
-    return list(dict.fromkeys(pool))
+            entry = f"关于“{kw}”的表述不符合该法条"
+            # De-duplicate while remembering which keyword produced each entry
+            i = index_of.get(entry)
+            if i is None:
+                i = index_of[entry] = len(entries)
+                entries.append(entry)
+            kw_to_indices.setdefault(kw, set()).add(i)
+    return DistractorPool(entries, kw_to_indices)
 
 
-def sample_distractors(pool: List[str], key: str, n: int, rng: random.Random) -> List[str]:
-    candidates = [p for p in pool if key not in p]
+def sample_distractors(pool: DistractorPool, keys: List[str], n: int, rng: random.Random) -> List[str]:
+    # Exclude entries built from any of the question's own keywords
+    excluded = set().union(*(pool.kw_to_indices.get(k, ()) for k in keys))
+    candidates = [p for i, p in enumerate(pool.entries) if i not in excluded]
     if len(candidates) < n:
-        candidates = pool
+        candidates = pool.entries
     return rng.sample(candidates, min(n, len(candidates)))
 
 
@@ -206,19 +236,25 @@ def assemble_exam(articles: List[Dict], cfg: Dict, rng: random.Random) -> Dict[s
     counts = cfg.get("counts", {})
     weights = cfg.get("weights", {})
 
-    tf_arts = weighted_sample(articles, weights, k=counts.get("true_false", 0) * 2)
-    sc_arts = weighted_sample(articles, weights, k=counts.get("single_choice", 0) * 2)
-    mc_arts = weighted_sample(articles, weights, k=counts.get("multiple_choice", 0) * 2)
-    fb_arts = weighted_sample(articles, weights, k=counts.get("fill_blank", 0) * 2)
+    # Weights are computed once and reused for every category; sampling is seeded from rng
+    p = article_weights(articles, weights) if articles else None
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    tf_arts = weighted_sample(articles, p, k=counts.get("true_false", 0) * 2, rng=np_rng)
+    sc_arts = weighted_sample(articles, p, k=counts.get("single_choice", 0) * 2, rng=np_rng)
+    mc_arts = weighted_sample(articles, p, k=counts.get("multiple_choice", 0) * 2, rng=np_rng)
+    fb_arts = weighted_sample(articles, p, k=counts.get("fill_blank", 0) * 2, rng=np_rng)
 
     short_important = [a for a in articles if a.get("article_no") in set(weights.get("important_articles", []))]
     if len(short_important) < counts.get("short_answer", 0):
         short_important = (short_important + articles)[: counts.get("short_answer", 0)]
 
+    # Shared by single and multiple choice; built once over the whole corpus
+    distractor_pool = build_distractor_pool(articles)
+
     exam = {
         "true_false": make_true_false(tf_arts, counts.get("true_false", 0), rng),
-        "single": make_single_choice(sc_arts, counts.get("single_choice", 0), rng),
-        "multiple": make_multiple_choice(mc_arts, counts.get("multiple_choice", 0), rng),
+        "single": make_single_choice(sc_arts, counts.get("single_choice", 0), rng, distractor_pool),
+        "multiple": make_multiple_choice(mc_arts, counts.get("multiple_choice", 0), rng, distractor_pool),
         "fill": make_fill_blank(fb_arts, counts.get("fill_blank", 0), rng),
         "short": make_short_answers(short_important, counts.get("short_answer", 0)),
     }
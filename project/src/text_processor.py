@@ -8,7 +8,7 @@ We use rule-based heuristics plus optional spaCy Chinese model if available.
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import re
 
 try:
@@ -18,26 +18,46 @@ except Exception:
     _SPACY_AVAILABLE = False
     spacy = None  # type: ignore
 
+_NLP: Optional["spacy.language.Language"] = None
 
 WHITESPACE_RE = re.compile(r"[\u3000\s]+")
+# Anything WHITESPACE_RE would change: whitespace other than a plain space, or a run of spaces
+NORMALIZE_NEEDED_RE = re.compile(r"[^\S ]| {2,}")
 PUNCTUATION_RE = re.compile(r"[，、。；：？！,.!?;:]")
 NUMBER_RE = re.compile(r"\d+")
 DATE_RE = re.compile(r"(\d{4})年(\d{1,2})月(\d{1,2})日")
+SENTENCE_END_RE = re.compile(r"[。；！？!?]")
 KEY_TERMS = [
     "不得", "应当", "可以", "必须", "禁止", "批准", "备案", "罚款", "责任", "义务",
 ]
+KEY_TERMS_RE = re.compile("|".join(map(re.escape, KEY_TERMS)))
+
+
+def _get_nlp() -> "spacy.language.Language":
+    # Build the blank Chinese pipeline once; users can install zh_core_web_sm or similar
+    global _NLP
+    if _NLP is None:
+        _NLP = spacy.blank("zh")
+    return _NLP
 
 
 def normalize_text(text: str) -> str:
+    if not NORMALIZE_NEEDED_RE.search(text):
+        return text.strip()
     text = WHITESPACE_RE.sub(" ", text)
     text = text.replace("\u00A0", " ")
     return text.strip()
 
 
 def split_sentences(text: str) -> List[str]:
-    # Rough Chinese sentence split on 。；！? with preservation
-    parts = re.split(r"(?<=[。；！？!?])", text)
-    return [p.strip() for p in parts if p and p.strip()]
+    # Rough Chinese sentence split on 。；！? with preservation; one forward scan, no lookbehind
+    out: List[str] = []
+    last = 0
+    for m in SENTENCE_END_RE.finditer(text):
+        out.append(text[last:m.end()].strip())
+        last = m.end()
+    out.append(text[last:].strip())
+    return [p for p in out if p]
 
 
 def extract_entities(text: str) -> Dict:
@@ -45,13 +65,22 @@ def extract_entities(text: str) -> Dict:
     norm = normalize_text(text)
     numbers = NUMBER_RE.findall(norm)
     dates = ["{}年{}月{}日".format(*m) for m in DATE_RE.findall(norm)]
-    terms = [t for t in KEY_TERMS if t in norm]
+    sentences = split_sentences(norm)
+
+    # Index fill-blank candidates (key terms and whole numbers) by where they occur, as
+    # (sentence_idx, start, end) spans; one key-term scan per sentence also yields the
+    # article's terms, in KEY_TERMS order
+    term_spans: Dict[str, List[Tuple[int, int, int]]] = {}
+    for i, sent in enumerate(sentences):
+        for pattern in (KEY_TERMS_RE, NUMBER_RE):
+            for m in pattern.finditer(sent):
+                term_spans.setdefault(m.group(0), []).append((i, m.start(), m.end()))
+    terms = [t for t in KEY_TERMS if t in term_spans]
 
     nouns: List[str] = []
     if _SPACY_AVAILABLE:
         try:
-            # Lazy load; users can install zh_core_web_sm or similar
-            nlp = spacy.blank("zh") if not hasattr(spacy, "load") else spacy.blank("zh")
+            nlp = _get_nlp()
             doc = nlp(norm)
             # Without POS model, fallback to heuristic: long tokens as candidates
             nouns = [t.text for t in doc if len(t.text) >= 2]
@@ -63,12 +92,22 @@ def extract_entities(text: str) -> Dict:
         "dates": dates,
         "terms": terms,
         "nouns": nouns,
-        "sentences": split_sentences(norm),
+        "sentences": sentences,
+        "term_spans": term_spans,
     }
 
 
 def pick_keywords(entities: Dict, max_k: int = 5) -> List[str]:
-    candidates = list(dict.fromkeys(entities.get("terms", []) + entities.get("nouns", [])))
-    return candidates[:max_k]
-
-
+    # Order-preserving de-dup over terms then nouns, stopping once max_k are found
+    seen: set = set()
+    out: List[str] = []
+    if max_k <= 0:
+        return out
+    for src in (entities.get("terms") or (), entities.get("nouns") or ()):
+        for x in src:
+            if x not in seen:
+                seen.add(x)
+                out.append(x)
+                if len(out) >= max_k:
+                    return out
+    return out